@@ -1,6 +1,8 @@
+from browser_use.llm_cache import setup_llm_cache
 from browser_use.logging_config import setup_logging
 
 setup_logging()
+setup_llm_cache()
 
 from browser_use.agent.prompts import SystemPrompt as SystemPrompt
 from browser_use.agent.service import Agent as Agent
@@ -100,6 +100,8 @@ class MessageManager:
 			filepaths_msg = HumanMessage(content=f'Here are file paths you can use: {self.settings.available_file_paths}')
 			self._add_message_with_tokens(filepaths_msg)
 
+		self.state.static_prefix_length = len(self.state.history.messages)
+
 	def add_new_task(self, new_task: str) -> None:
 		content = f'Your new ultimate task is: """{new_task}""". Take the previous context into account and finish your new ultimate task. '
 		msg = HumanMessage(content=content)
@@ -173,12 +175,13 @@ class MessageManager:
 
 		msg = [m.message for m in self.state.history.messages]
 		# debug which messages are in history with token count # log
-		total_input_tokens = 0
-		logger.debug(f'Messages in history: {len(self.state.history.messages)}:')
-		for m in self.state.history.messages:
-			total_input_tokens += m.metadata.tokens
-			logger.debug(f'{m.message.__class__.__name__} - Token count: {m.metadata.tokens}')
-		logger.debug(f'Total input tokens: {total_input_tokens}')
+		if logger.isEnabledFor(logging.DEBUG):
+			total_input_tokens = 0
+			logger.debug(f'Messages in history: {len(self.state.history.messages)}:')
+			for m in self.state.history.messages:
+				total_input_tokens += m.metadata.tokens
+				logger.debug(f'{m.message.__class__.__name__} - Token count: {m.metadata.tokens}')
+			logger.debug(f'Total input tokens: {total_input_tokens}')
 
 		return msg
 
@@ -4,6 +4,7 @@ from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_openai import AzureChatOpenAI, ChatOpenAI
 
 from browser_use.agent.message_manager.service import MessageManager, MessageManagerSettings
+from browser_use.agent.message_manager.utils import add_cache_control, extract_json_from_model_output
 from browser_use.agent.views import ActionResult
 from browser_use.browser.views import BrowserState, TabInfo
 from browser_use.dom.views import DOMElementNode, DOMTextNode
@@ -235,3 +236,55 @@ def test_token_overflow_handling_with_real_flow(message_manager: MessageManager,
 
 
 # pytest -s browser_use/agent/message_manager/tests.py
+
+
+@pytest.mark.parametrize(
+	'content, expected',
+	[
+		('{"a": 1}', {'a': 1}),
+		('```json\n{"a": 1}\n```', {'a': 1}),
+		('```\n{"a": 1}\n```', {'a': 1}),
+		('Here is the output: ```json {"a": 1}``` done', {'a': 1}),
+		('```json\n{"a": 1}', {'a': 1}),
+		('\ufeff{"a": 1}', {'a': 1}),
+		('{"text": "```python\\nprint(1)\\n```"}', {'text': '```python\nprint(1)\n```'}),
+	],
+	ids=['plain', 'fenced', 'fenced-no-language', 'inline-fence', 'unclosed-fence', 'bom', 'plain-with-fence-in-value'],
+)
+def test_extract_json_from_model_output(content: str, expected: dict):
+	assert extract_json_from_model_output(content) == expected
+
+
+def test_extract_json_from_model_output_invalid():
+	with pytest.raises(ValueError):
+		extract_json_from_model_output('```json\nnot json\n```')
+
+
+def test_add_cache_control_str_content():
+	message = HumanMessage(content='Your ultimate task is: ...')
+	marked = add_cache_control(message)
+	assert marked.content == [{'type': 'text', 'text': 'Your ultimate task is: ...', 'cache_control': {'type': 'ephemeral'}}]
+	# the original message is not mutated
+	assert message.content == 'Your ultimate task is: ...'
+
+
+def test_add_cache_control_list_content():
+	content = [
+		{'type': 'text', 'text': 'Current state'},
+		{'type': 'image_url', 'image_url': {'url': 'data:image/png;base64,abc'}},
+	]
+	message = HumanMessage(content=content)
+	marked = add_cache_control(message)
+	# only the last content block carries the breakpoint
+	assert 'cache_control' not in marked.content[0]
+	assert marked.content[1]['cache_control'] == {'type': 'ephemeral'}
+	# the original message is not mutated
+	assert message.content == [
+		{'type': 'text', 'text': 'Current state'},
+		{'type': 'image_url', 'image_url': {'url': 'data:image/png;base64,abc'}},
+	]
+
+
+def test_add_cache_control_empty_content():
+	message = AIMessage(content='')
+	assert add_cache_control(message) is message
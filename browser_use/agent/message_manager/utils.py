@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import json
 import logging
 import os
+import re
 from typing import Any, Optional, Type
 
+import orjson
 from langchain_core.messages import (
 	AIMessage,
 	BaseMessage,
@@ -15,29 +16,41 @@ from langchain_core.messages import (
 
 logger = logging.getLogger(__name__)
 
+# JSON wrapped in a markdown code block, the closing fence may be missing if the output was cut off
+JSON_CODE_BLOCK_PATTERN = re.compile(r'```[a-zA-Z]*\s*(.*?)\s*(?:```|$)', re.DOTALL)
+
 
 def extract_json_from_model_output(content: str) -> dict:
 	"""Extract JSON from model output, handling both plain JSON and code-block-wrapped JSON."""
+	content = content.strip().lstrip('\ufeff')
+	try:
+		# Plain JSON first - its string values may contain code fences themselves
+		return orjson.loads(content)
+	except orjson.JSONDecodeError:
+		pass
+
 	try:
 		# If content is wrapped in code blocks, extract just the JSON part
-		if '```' in content:
-			# Find the JSON content between code blocks
-			content = content.split('```')[1]
-			# Remove language identifier if present (e.g., 'json\n')
-			if '\n' in content:
-				content = content.split('\n', 1)[1]
-		# Parse the cleaned content
-		return json.loads(content)
-	except json.JSONDecodeError as e:
-		logger.warning(f'Failed to parse model output: {content} {str(e)}')
+		match = JSON_CODE_BLOCK_PATTERN.search(content)
+		if match:
+			content = match.group(1).strip()
+		return orjson.loads(content)
+	except orjson.JSONDecodeError as e:
+		# callers decide whether a failed parse is worth a warning - the structured output fallback expects misses
+		logger.debug(f'Failed to parse model output: {content} {str(e)}')
 		raise ValueError('Could not parse response.')
 
 
+def is_model_without_tool_support(model_name: Optional[str]) -> bool:
+	"""Models without function calling - their tool calls have to go through the message content"""
+	if model_name is None:
+		return False
+	return model_name == 'deepseek-reasoner' or model_name.startswith('deepseek-r1')
+
+
 def convert_input_messages(input_messages: list[BaseMessage], model_name: Optional[str]) -> list[BaseMessage]:
 	"""Convert input messages to a format that is compatible with the planner model"""
-	if model_name is None:
-		return input_messages
-	if model_name == 'deepseek-reasoner' or model_name.startswith('deepseek-r1'):
+	if is_model_without_tool_support(model_name):
 		converted_input_messages = _convert_messages_for_non_function_calling_models(input_messages)
 		merged_input_messages = _merge_successive_messages(converted_input_messages, HumanMessage)
 		merged_input_messages = _merge_successive_messages(merged_input_messages, AIMessage)
@@ -45,6 +58,19 @@ def convert_input_messages(input_messages: list[BaseMessage], model_name: Option
 	return input_messages
 
 
+def add_cache_control(message: BaseMessage) -> BaseMessage:
+	"""Return a copy of the message marked as an Anthropic prompt-cache breakpoint - everything up to it is cached"""
+	if not message.content:
+		return message
+
+	if isinstance(message.content, str):
+		content = [{'type': 'text', 'text': message.content}]
+	else:
+		content = [item if isinstance(item, dict) else {'type': 'text', 'text': item} for item in message.content]
+	content[-1] = {**content[-1], 'cache_control': {'type': 'ephemeral'}}
+	return message.model_copy(update={'content': content})
+
+
 def _convert_messages_for_non_function_calling_models(input_messages: list[BaseMessage]) -> list[BaseMessage]:
 	"""Convert messages for non-function-calling models"""
 	output_messages = []
@@ -58,7 +84,7 @@ def _convert_messages_for_non_function_calling_models(input_messages: list[BaseM
 		elif isinstance(message, AIMessage):
 			# check if tool_calls is a valid JSON object
 			if message.tool_calls:
-				tool_calls = json.dumps(message.tool_calls)
+				tool_calls = orjson.dumps(message.tool_calls).decode()
 				output_messages.append(AIMessage(content=tool_calls))
 			else:
 				output_messages.append(message)
@@ -113,9 +139,9 @@ def _write_messages_to_file(f: Any, messages: list[BaseMessage]) -> None:
 					f.write(item['text'].strip() + '\n')
 		elif isinstance(message.content, str):
 			try:
-				content = json.loads(message.content)
-				f.write(json.dumps(content, indent=2) + '\n')
-			except json.JSONDecodeError:
+				content = orjson.loads(message.content)
+				f.write(orjson.dumps(content, option=orjson.OPT_INDENT_2).decode() + '\n')
+			except orjson.JSONDecodeError:
 				f.write(message.content.strip() + '\n')
 
 		f.write('\n')
@@ -124,4 +150,4 @@ def _write_messages_to_file(f: Any, messages: list[BaseMessage]) -> None:
 def _write_response_to_file(f: Any, response: Any) -> None:
 	"""Write model response to conversation file"""
 	f.write(' RESPONSE\n')
-	f.write(json.dumps(json.loads(response.model_dump_json(exclude_unset=True)), indent=2))
+	f.write(orjson.dumps(response.model_dump(mode='json', exclude_unset=True), option=orjson.OPT_INDENT_2).decode())
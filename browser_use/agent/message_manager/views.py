@@ -1,14 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import Any
 
 from langchain_core.load import dumpd, load
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from pydantic import BaseModel, ConfigDict, Field, model_serializer, model_validator
 
-if TYPE_CHECKING:
-	from browser_use.agent.views import AgentOutput
-
 
 class MessageMetadata(BaseModel):
 	"""Metadata for a message"""
@@ -76,27 +73,6 @@ class MessageHistory(BaseModel):
 			self.messages.insert(position, ManagedMessage(message=message, metadata=metadata))
 		self.current_tokens += metadata.tokens
 
-	def add_model_output(self, output: 'AgentOutput') -> None:
-		"""Add model output as AI message"""
-		tool_calls = [
-			{
-				'name': 'AgentOutput',
-				'args': output.model_dump(mode='json', exclude_unset=True),
-				'id': '1',
-				'type': 'tool_call',
-			}
-		]
-
-		msg = AIMessage(
-			content='',
-			tool_calls=tool_calls,
-		)
-		self.add_message(msg, MessageMetadata(tokens=100))  # Estimate tokens for tool calls
-
-		# Empty tool response
-		tool_message = ToolMessage(content='', tool_call_id='1')
-		self.add_message(tool_message, MessageMetadata(tokens=10))  # Estimate tokens for empty response
-
 	def get_messages(self) -> list[BaseMessage]:
 		"""Get all messages"""
 		return [m.message for m in self.messages]
@@ -125,5 +101,7 @@ class MessageManagerState(BaseModel):
 
 	history: MessageHistory = Field(default_factory=MessageHistory)
 	tool_id: int = 1
+	# number of initial messages (system prompt, task, examples) that stay the same in every step
+	static_prefix_length: int = 0
 
 	model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import re
 import time
+from functools import cache
 from pathlib import Path
 from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, TypeVar
 
+import orjson
 from dotenv import load_dotenv
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import (
@@ -21,7 +22,13 @@ from pydantic import BaseModel, ValidationError
 
 from browser_use.agent.gif import create_history_gif
 from browser_use.agent.message_manager.service import MessageManager, MessageManagerSettings
-from browser_use.agent.message_manager.utils import convert_input_messages, extract_json_from_model_output, save_conversation
+from browser_use.agent.message_manager.utils import (
+	add_cache_control,
+	convert_input_messages,
+	extract_json_from_model_output,
+	is_model_without_tool_support,
+	save_conversation,
+)
 from browser_use.agent.prompts import AgentMessagePrompt, PlannerPrompt, SystemPrompt
 from browser_use.agent.views import (
 	ActionResult,
@@ -44,6 +51,7 @@ from browser_use.dom.history_tree_processor.service import (
 	DOMHistoryElement,
 	HistoryTreeProcessor,
 )
+from browser_use.llm_cache import warn_if_llm_not_deterministic
 from browser_use.telemetry.service import ProductTelemetry
 from browser_use.telemetry.views import (
 	AgentEndTelemetryEvent,
@@ -56,6 +64,37 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+@cache
+def _get_browser_use_version_and_source() -> tuple[str, str]:
+	"""Resolved once per process, the git/pip lookup doesn't change between agents"""
+	try:
+		# First check for repository-specific files
+		repo_files = ['.git', 'README.md', 'docs', 'examples']
+		package_root = Path(__file__).parent.parent.parent
+
+		# If all of these files/dirs exist, it's likely from git
+		if all(Path(package_root / file).exists() for file in repo_files):
+			try:
+				import subprocess
+
+				version = subprocess.check_output(['git', 'describe', '--tags']).decode('utf-8').strip()
+			except Exception:
+				version = 'unknown'
+			source = 'git'
+		else:
+			# If no repo files found, try getting version from pip
+			from importlib.metadata import version as get_distribution_version
+
+			version = get_distribution_version('browser-use')
+			source = 'pip'
+	except Exception:
+		version = 'unknown'
+		source = 'unknown'
+
+	logger.debug(f'Version: {version}, Source: {source}')
+	return version, source
+
+
 def log_response(response: AgentOutput) -> None:
 	"""Utility function to log the model's response."""
 
@@ -170,6 +209,7 @@ class Agent(Generic[Context]):
 
 		# Model setup
 		self._set_model_names()
+		warn_if_llm_not_deterministic(self.llm)
 
 		# for models without tool calling, add available actions to context
 		self.available_actions = self.controller.registry.get_prompt_description()
@@ -232,33 +272,7 @@ class Agent(Generic[Context]):
 
 	def _set_browser_use_version_and_source(self) -> None:
 		"""Get the version and source of the browser-use package (git or pip in a nutshell)"""
-		try:
-			# First check for repository-specific files
-			repo_files = ['.git', 'README.md', 'docs', 'examples']
-			package_root = Path(__file__).parent.parent.parent
-
-			# If all of these files/dirs exist, it's likely from git
-			if all(Path(package_root / file).exists() for file in repo_files):
-				try:
-					import subprocess
-
-					version = subprocess.check_output(['git', 'describe', '--tags']).decode('utf-8').strip()
-				except Exception:
-					version = 'unknown'
-				source = 'git'
-			else:
-				# If no repo files found, try getting version from pip
-				import pkg_resources
-
-				version = pkg_resources.get_distribution('browser-use').version
-				source = 'pip'
-		except Exception:
-			version = 'unknown'
-			source = 'unknown'
-
-		logger.debug(f'Version: {version}, Source: {source}')
-		self.version = version
-		self.source = source
+		self.version, self.source = _get_browser_use_version_and_source()
 
 	def _set_model_names(self) -> None:
 		self.chat_model_library = self.llm.__class__.__name__
@@ -293,7 +307,7 @@ class Agent(Generic[Context]):
 	def _set_tool_calling_method(self) -> Optional[ToolCallingMethod]:
 		tool_calling_method = self.settings.tool_calling_method
 		if tool_calling_method == 'auto':
-			if self.model_name == 'deepseek-reasoner' or self.model_name.startswith('deepseek-r1'):
+			if is_model_without_tool_support(self.model_name):
 				return 'raw'
 			elif self.chat_model_library == 'ChatGoogleGenerativeAI':
 				return None
@@ -446,10 +460,7 @@ class Agent(Generic[Context]):
 
 			self.state.consecutive_failures += 1
 		else:
-			from google.api_core.exceptions import ResourceExhausted
-			from openai import RateLimitError
-
-			if isinstance(error, RateLimitError) or isinstance(error, ResourceExhausted):
+			if AgentError.is_rate_limit_error(error):
 				logger.warning(f'{prefix}{error_msg}')
 				await asyncio.sleep(self.settings.retry_delay)
 				self.state.consecutive_failures += 1
@@ -493,18 +504,36 @@ class Agent(Generic[Context]):
 
 	def _convert_input_messages(self, input_messages: list[BaseMessage]) -> list[BaseMessage]:
 		"""Convert input messages to the correct format"""
-		if self.model_name == 'deepseek-reasoner' or self.model_name.startswith('deepseek-r1'):
+		if is_model_without_tool_support(self.model_name):
 			return convert_input_messages(input_messages, self.model_name)
+		elif self.chat_model_library == 'ChatAnthropic' and input_messages:
+			# the system prompt and the task preamble are identical in every step - let anthropic serve them from the prompt cache
+			messages = [add_cache_control(input_messages[0]), *input_messages[1:]]
+			prefix_end = min(self._message_manager.state.static_prefix_length, len(messages)) - 1
+			if prefix_end > 0:
+				messages[prefix_end] = add_cache_control(messages[prefix_end])
+			return messages
 		else:
 			return input_messages
 
+	def _parse_raw_output(self, raw: Any) -> AgentOutput | None:
+		"""Fallback if structured output parsing failed - some models answer with the JSON in the content instead of a tool call.
+		Recovering it here saves a whole retry step."""
+		content = getattr(raw, 'content', None)
+		if not content or not isinstance(content, str):
+			return None
+		try:
+			return self.AgentOutput.model_validate(extract_json_from_model_output(self._remove_think_tags(content)))
+		except (ValueError, ValidationError):
+			return None
+
 	@time_execution_async('--get_next_action (agent)')
 	async def get_next_action(self, input_messages: list[BaseMessage]) -> AgentOutput:
 		"""Get next action from LLM based on current state"""
 		input_messages = self._convert_input_messages(input_messages)
 
 		if self.tool_calling_method == 'raw':
-			output = self.llm.invoke(input_messages)
+			output = await self.llm.ainvoke(input_messages)
 			# TODO: currently invoke does not return reasoning_content, we should override invoke
 			output.content = self._remove_think_tags(str(output.content))
 			try:
@@ -517,11 +546,11 @@ class Agent(Generic[Context]):
 		elif self.tool_calling_method is None:
 			structured_llm = self.llm.with_structured_output(self.AgentOutput, include_raw=True)
 			response: dict[str, Any] = await structured_llm.ainvoke(input_messages)  # type: ignore
-			parsed: AgentOutput | None = response['parsed']
+			parsed: AgentOutput | None = response['parsed'] or self._parse_raw_output(response['raw'])
 		else:
 			structured_llm = self.llm.with_structured_output(self.AgentOutput, include_raw=True, method=self.tool_calling_method)
 			response: dict[str, Any] = await structured_llm.ainvoke(input_messages)  # type: ignore
-			parsed: AgentOutput | None = response['parsed']
+			parsed: AgentOutput | None = response['parsed'] or self._parse_raw_output(response['raw'])
 
 		if parsed is None:
 			raise ValueError('Could not parse response.')
@@ -940,13 +969,13 @@ class Agent(Generic[Context]):
 		# Get planner output
 		response = await self.settings.planner_llm.ainvoke(planner_messages)
 		plan = str(response.content)
-		# if deepseek-reasoner, remove think tags
-		if self.planner_model_name == 'deepseek-reasoner':
+		# reasoning models without tool support (deepseek-reasoner / r1) return think tags
+		if is_model_without_tool_support(self.planner_model_name):
 			plan = self._remove_think_tags(plan)
 		try:
-			plan_json = json.loads(plan)
-			logger.info(f'Planning Analysis:\n{json.dumps(plan_json, indent=4)}')
-		except json.JSONDecodeError:
+			plan_json = orjson.loads(plan)
+			logger.info(f'Planning Analysis:\n{orjson.dumps(plan_json, option=orjson.OPT_INDENT_2).decode()}')
+		except orjson.JSONDecodeError:
 			logger.info(f'Planning Analysis:\n{plan}')
 		except Exception as e:
 			logger.debug(f'Error parsing planning analysis: {e}')
@@ -1,14 +1,13 @@
 from __future__ import annotations
 
-import json
 import traceback
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Literal, Optional, Type
 
+import orjson
 from langchain_core.language_models.chat_models import BaseChatModel
-from openai import RateLimitError
 from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model
 
 from browser_use.agent.message_manager.views import MessageManagerState
@@ -235,8 +234,8 @@ class AgentHistoryList(BaseModel):
 		try:
 			Path(filepath).parent.mkdir(parents=True, exist_ok=True)
 			data = self.model_dump()
-			with open(filepath, 'w', encoding='utf-8') as f:
-				json.dump(data, f, indent=2)
+			with open(filepath, 'wb') as f:
+				f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 		except Exception as e:
 			raise e
 
@@ -249,8 +248,8 @@ class AgentHistoryList(BaseModel):
 	@classmethod
 	def load_from_file(cls, filepath: str | Path, output_model: Type[AgentOutput]) -> 'AgentHistoryList':
 		"""Load history from JSON file"""
-		with open(filepath, 'r', encoding='utf-8') as f:
-			data = json.load(f)
+		with open(filepath, 'rb') as f:
+			data = orjson.loads(f.read())
 		# loop through history and validate output_model actions to enrich with custom actions
 		for h in data['history']:
 			if h['model_output']:
@@ -305,7 +304,7 @@ class AgentHistoryList(BaseModel):
 		return any(error is not None for error in self.errors())
 
 	def urls(self) -> list[str | None]:
-		"""Get all unique URLs from history"""
+		"""Get the URL of each step in history, aligned with screenshots() and errors()"""
 		return [h.state.url if h.state.url is not None else None for h in self.history]
 
 	def screenshots(self) -> list[str | None]:
@@ -358,15 +357,10 @@ class AgentHistoryList(BaseModel):
 
 	def model_actions_filtered(self, include: list[str] | None = None) -> list[dict]:
 		"""Get all model actions from history as JSON"""
-		if include is None:
-			include = []
-		outputs = self.model_actions()
-		result = []
-		for o in outputs:
-			for i in include:
-				if i == list(o.keys())[0]:
-					result.append(o)
-		return result
+		if not include:
+			return []
+		include_set = set(include)
+		return [o for o in self.model_actions() if next(iter(o)) in include_set]
 
 	def number_of_steps(self) -> int:
 		"""Get the number of steps in the history"""
@@ -386,8 +380,32 @@ class AgentError:
 		message = ''
 		if isinstance(error, ValidationError):
 			return f'{AgentError.VALIDATION_ERROR}\nDetails: {str(error)}'
-		if isinstance(error, RateLimitError):
+		if AgentError.is_rate_limit_error(error):
 			return AgentError.RATE_LIMIT_ERROR
 		if include_trace:
 			return f'{str(error)}\nStacktrace:\n{traceback.format_exc()}'
 		return f'{str(error)}'
+
+	@staticmethod
+	def is_rate_limit_error(error: Exception) -> bool:
+		"""
+		Check for provider rate limit errors - the provider SDKs are imported lazily
+		since they are slow to import and optional
+		"""
+		try:
+			from openai import RateLimitError
+
+			if isinstance(error, RateLimitError):
+				return True
+		except ImportError:
+			pass
+
+		try:
+			from google.api_core.exceptions import ResourceExhausted
+
+			if isinstance(error, ResourceExhausted):
+				return True
+		except ImportError:
+			pass
+
+		return False
@@ -44,6 +44,12 @@ class BrowserConfig:
 		chrome_instance_path: None
 			Path to a Chrome instance to use to connect to your normal browser
 			e.g. '/Applications/Google\ Chrome.app/Contents/MacOS/Google\ Chrome'
+
+		disk_cache_dir: None
+			Directory for Chromium's HTTP disk cache. By default every launch starts with an empty cache,
+			set this to reuse cached assets (scripts, stylesheets, images) across runs.
+			Only applies when browser-use launches the browser itself - it is ignored with
+			chrome_instance_path, cdp_url and wss_url
 	"""
 
 	headless: bool = False
@@ -53,6 +59,8 @@ class BrowserConfig:
 	wss_url: str | None = None
 	cdp_url: str | None = None
 
+	disk_cache_dir: str | None = None
+
 	proxy: ProxySettings | None = field(default=None)
 	new_context_config: BrowserContextConfig = field(default_factory=BrowserContextConfig)
 
@@ -77,6 +85,8 @@ class Browser:
 		self.config = config
 		self.playwright: Playwright | None = None
 		self.playwright_browser: PlaywrightBrowser | None = None
+		# contexts created concurrently must share one launch
+		self._init_lock = asyncio.Lock()
 
 		self.disable_security_args = []
 		if self.config.disable_security:
@@ -93,7 +103,9 @@ class Browser:
 	async def get_playwright_browser(self) -> PlaywrightBrowser:
 		"""Get a browser context"""
 		if self.playwright_browser is None:
-			return await self._init()
+			async with self._init_lock:
+				if self.playwright_browser is None:
+					return await self._init()
 
 		return self.playwright_browser
 
@@ -181,6 +193,10 @@ class Browser:
 
 	async def _setup_standard_browser(self, playwright: Playwright) -> PlaywrightBrowser:
 		"""Sets up and returns a Playwright Browser instance with anti-detection measures."""
+		cache_args = []
+		if self.config.disk_cache_dir:
+			cache_args = [f'--disk-cache-dir={self.config.disk_cache_dir}']
+
 		browser = await playwright.chromium.launch(
 			headless=self.config.headless,
 			args=[
@@ -200,6 +216,7 @@ class Browser:
 				# '--window-size=1280,1000',
 			]
 			+ self.disable_security_args
+			+ cache_args
 			+ self.config.extra_chromium_args,
 			proxy=self.config.proxy,
 		)
@@ -208,6 +225,11 @@ class Browser:
 
 	async def _setup_browser(self, playwright: Playwright) -> PlaywrightBrowser:
 		"""Sets up and returns a Playwright Browser instance with anti-detection measures."""
+		if self.config.disk_cache_dir and (self.config.cdp_url or self.config.wss_url or self.config.chrome_instance_path):
+			logger.warning(
+				'disk_cache_dir only applies to browsers launched by browser-use, it is ignored with cdp_url, wss_url '
+				'and chrome_instance_path'
+			)
 		try:
 			if self.config.cdp_url:
 				return await self._setup_cdp(playwright)
@@ -5,15 +5,18 @@ Playwright browser on steroids.
 import asyncio
 import base64
 import gc
-import json
 import logging
 import os
 import re
 import time
 import uuid
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import TYPE_CHECKING, Optional, TypedDict
+from urllib.parse import urlparse
 
+import orjson
+from playwright._impl._errors import Error as PlaywrightError
 from playwright._impl._errors import TimeoutError
 from playwright.async_api import Browser as PlaywrightBrowser
 from playwright.async_api import (
@@ -23,6 +26,8 @@ from playwright.async_api import (
 	ElementHandle,
 	FrameLocator,
 	Page,
+	Request,
+	Route,
 )
 
 from browser_use.browser.views import (
@@ -40,6 +45,100 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+VALID_CLASS_NAME_PATTERN = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_-]*$')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# seconds to skip a url in navigate_to after it failed to load
+FAILED_URL_TTL = 300
+# dns and connection errors that mark a url as dead, other navigation errors can be retried right away
+DEAD_URL_NET_ERRORS = (
+	'net::ERR_NAME_NOT_RESOLVED',
+	'net::ERR_NAME_RESOLUTION_FAILED',
+	'net::ERR_CONNECTION_REFUSED',
+	'net::ERR_CONNECTION_TIMED_OUT',
+	'net::ERR_ADDRESS_UNREACHABLE',
+)
+
+# Requests that count towards network activity in _wait_for_stable_network
+RELEVANT_RESOURCE_TYPES = frozenset({'document', 'stylesheet', 'image', 'font', 'script', 'iframe'})
+RELEVANT_CONTENT_TYPES = ('text/html', 'text/css', 'application/javascript', 'image/', 'font/', 'application/json')
+
+# Streaming, websocket, and other real-time requests
+IGNORED_RESOURCE_TYPES = frozenset({'websocket', 'media', 'eventsource', 'manifest', 'other'})
+IGNORED_FETCH_DESTINATIONS = frozenset({'video', 'audio'})
+STREAMING_CONTENT_TYPES = ('streaming', 'video', 'audio', 'webm', 'mp4', 'event-stream', 'websocket', 'protobuf')
+
+# Additional patterns to filter out
+IGNORED_URL_PATTERNS = (
+	# Analytics and tracking
+	'analytics',
+	'tracking',
+	'telemetry',
+	'beacon',
+	'metrics',
+	# Ad-related
+	'doubleclick',
+	'adsystem',
+	'adserver',
+	'advertising',
+	# Social media widgets
+	'facebook.com/plugins',
+	'platform.twitter',
+	'linkedin.com/embed',
+	# Live chat and support
+	'livechat',
+	'zendesk',
+	'intercom',
+	'crisp.chat',
+	'hotjar',
+	# Push notifications
+	'push-notifications',
+	'onesignal',
+	'pushwoosh',
+	# Background sync/heartbeat
+	'heartbeat',
+	'ping',
+	'alive',
+	# WebRTC and streaming
+	'webrtc',
+	'rtmp://',
+	'wss://',
+	# Common CDNs for dynamic content
+	'cloudfront.net',
+	'fastly.net',
+)
+
+# Expanded set of safe attributes that are stable and useful for selection
+SAFE_ATTRIBUTES = frozenset(
+	{
+		# Data attributes (if they're stable in your application)
+		'id',
+		# Standard HTML attributes
+		'name',
+		'type',
+		'placeholder',
+		# Accessibility attributes
+		'aria-label',
+		'aria-labelledby',
+		'aria-describedby',
+		'role',
+		# Common form attributes
+		'for',
+		'autocomplete',
+		'required',
+		'readonly',
+		# Media attributes
+		'alt',
+		'title',
+		'src',
+		# Custom stable attributes (add any application-specific ones)
+		'href',
+		'target',
+	}
+)
+DYNAMIC_ATTRIBUTES = frozenset({'data-id', 'data-qa', 'data-cy', 'data-testid'})
+SAFE_AND_DYNAMIC_ATTRIBUTES = SAFE_ATTRIBUTES | DYNAMIC_ATTRIBUTES
+
 
 class BrowserContextWindowSize(TypedDict):
 	width: int
@@ -107,6 +206,14 @@ class BrowserContextConfig:
 
 	    include_dynamic_attributes: bool = True
 	        Include dynamic attributes in the CSS selector. If you want to reuse the css_selectors, it might be better to set this to False.
+
+	    blocked_resource_types: None
+	        Playwright resource types to abort instead of downloading, e.g. ['image', 'media', 'font'].
+	        Speeds up page loads, but blocked content is missing from screenshots.
+
+	    blocked_domains: None
+	        List of domains whose requests are aborted, e.g. trackers and ads.
+	        Example: ['google-analytics.com', 'doubleclick.net']
 	"""
 
 	cookies_file: str | None = None
@@ -133,6 +240,9 @@ class BrowserContextConfig:
 	allowed_domains: list[str] | None = None
 	include_dynamic_attributes: bool = True
 
+	blocked_resource_types: list[str] | None = None
+	blocked_domains: list[str] | None = None
+
 	_force_keep_context_alive: bool = False
 
 
@@ -169,6 +279,12 @@ class BrowserContext:
 		# Initialize these as None - they'll be set up when needed
 		self.session: BrowserSession | None = None
 
+		# urls that failed to load -> time until which navigation to them is skipped
+		self._failed_urls: dict[str, float] = {}
+
+		# get_state saves cookies in a background task and close() saves them again - writes must not overlap
+		self._cookies_lock = asyncio.Lock()
+
 	async def __aenter__(self):
 		"""Async context manager entry"""
 		await self._initialize_session()
@@ -333,10 +449,10 @@ class BrowserContext:
 
 		# Load cookies if they exist
 		if self.config.cookies_file and os.path.exists(self.config.cookies_file):
-			with open(self.config.cookies_file, 'r') as f:
-				cookies = json.load(f)
-				logger.info(f'Loaded {len(cookies)} cookies from {self.config.cookies_file}')
-				await context.add_cookies(cookies)
+			# read off the event loop, cookie files can get large
+			cookies = orjson.loads(await asyncio.to_thread(Path(self.config.cookies_file).read_bytes))
+			logger.info(f'Loaded {len(cookies)} cookies from {self.config.cookies_file}')
+			await context.add_cookies(cookies)
 
 		# Expose anti-detection scripts
 		await context.add_init_script(
@@ -375,86 +491,49 @@ class BrowserContext:
             """
 		)
 
+		if self.config.blocked_resource_types or self.config.blocked_domains:
+			await context.route('**/*', self._block_requests)
+
 		return context
 
+	def _is_request_blocked(self, request: Request) -> bool:
+		"""Check if a request matches the blocked resource types or domains"""
+		if self.config.blocked_resource_types and request.resource_type in self.config.blocked_resource_types:
+			return True
+
+		if self.config.blocked_domains:
+			domain = (urlparse(request.url).hostname or '').lower()
+			return any(
+				domain == blocked.lower() or domain.endswith('.' + blocked.lower()) for blocked in self.config.blocked_domains
+			)
+
+		return False
+
+	async def _block_requests(self, route: Route) -> None:
+		"""Abort requests for blocked resource types or domains, let everything else through"""
+		if self._is_request_blocked(route.request):
+			await route.abort()
+		else:
+			await route.fallback()
+
 	async def _wait_for_stable_network(self):
 		page = await self.get_current_page()
 
 		pending_requests = set()
-		last_activity = asyncio.get_event_loop().time()
-
-		# Define relevant resource types and content types
-		RELEVANT_RESOURCE_TYPES = {
-			'document',
-			'stylesheet',
-			'image',
-			'font',
-			'script',
-			'iframe',
-		}
-
-		RELEVANT_CONTENT_TYPES = {
-			'text/html',
-			'text/css',
-			'application/javascript',
-			'image/',
-			'font/',
-			'application/json',
-		}
-
-		# Additional patterns to filter out
-		IGNORED_URL_PATTERNS = {
-			# Analytics and tracking
-			'analytics',
-			'tracking',
-			'telemetry',
-			'beacon',
-			'metrics',
-			# Ad-related
-			'doubleclick',
-			'adsystem',
-			'adserver',
-			'advertising',
-			# Social media widgets
-			'facebook.com/plugins',
-			'platform.twitter',
-			'linkedin.com/embed',
-			# Live chat and support
-			'livechat',
-			'zendesk',
-			'intercom',
-			'crisp.chat',
-			'hotjar',
-			# Push notifications
-			'push-notifications',
-			'onesignal',
-			'pushwoosh',
-			# Background sync/heartbeat
-			'heartbeat',
-			'ping',
-			'alive',
-			# WebRTC and streaming
-			'webrtc',
-			'rtmp://',
-			'wss://',
-			# Common CDNs for dynamic content
-			'cloudfront.net',
-			'fastly.net',
-		}
+		loop = asyncio.get_running_loop()
+		last_activity = loop.time()
 
 		async def on_request(request):
 			# Filter by resource type
 			if request.resource_type not in RELEVANT_RESOURCE_TYPES:
 				return
 
+			# Blocked requests are aborted and never get a response
+			if self._is_request_blocked(request):
+				return
+
 			# Filter out streaming, websocket, and other real-time requests
-			if request.resource_type in {
-				'websocket',
-				'media',
-				'eventsource',
-				'manifest',
-				'other',
-			}:
+			if request.resource_type in IGNORED_RESOURCE_TYPES:
 				return
 
 			# Filter out by URL patterns
@@ -468,15 +547,12 @@ class BrowserContext:
 
 			# Filter out requests with certain headers
 			headers = request.headers
-			if headers.get('purpose') == 'prefetch' or headers.get('sec-fetch-dest') in [
-				'video',
-				'audio',
-			]:
+			if headers.get('purpose') == 'prefetch' or headers.get('sec-fetch-dest') in IGNORED_FETCH_DESTINATIONS:
 				return
 
 			nonlocal last_activity
 			pending_requests.add(request)
-			last_activity = asyncio.get_event_loop().time()
+			last_activity = loop.time()
 			# logger.debug(f'Request started: {request.url} ({request.resource_type})')
 
 		async def on_response(response):
@@ -488,19 +564,7 @@ class BrowserContext:
 			content_type = response.headers.get('content-type', '').lower()
 
 			# Skip if content type indicates streaming or real-time data
-			if any(
-				t in content_type
-				for t in [
-					'streaming',
-					'video',
-					'audio',
-					'webm',
-					'mp4',
-					'event-stream',
-					'websocket',
-					'protobuf',
-				]
-			):
+			if any(t in content_type for t in STREAMING_CONTENT_TYPES):
 				pending_requests.remove(request)
 				return
 
@@ -517,19 +581,24 @@ class BrowserContext:
 
 			nonlocal last_activity
 			pending_requests.remove(request)
-			last_activity = asyncio.get_event_loop().time()
+			last_activity = loop.time()
 			# logger.debug(f'Request resolved: {request.url} ({content_type})')
 
+		async def on_request_failed(request):
+			# failed or aborted requests never get a response
+			pending_requests.discard(request)
+
 		# Attach event listeners
 		page.on('request', on_request)
 		page.on('response', on_response)
+		page.on('requestfailed', on_request_failed)
 
 		try:
 			# Wait for idle time
-			start_time = asyncio.get_event_loop().time()
+			start_time = loop.time()
 			while True:
 				await asyncio.sleep(0.1)
-				now = asyncio.get_event_loop().time()
+				now = loop.time()
 				if len(pending_requests) == 0 and (now - last_activity) >= self.config.wait_for_network_idle_page_load_time:
 					break
 				if now - start_time > self.config.maximum_wait_page_load_time:
@@ -543,6 +612,7 @@ class BrowserContext:
 			# Clean up event listeners
 			page.remove_listener('request', on_request)
 			page.remove_listener('response', on_response)
+			page.remove_listener('requestfailed', on_request_failed)
 
 		logger.debug(f'Network stabilized for {self.config.wait_for_network_idle_page_load_time} seconds')
 
@@ -584,8 +654,6 @@ class BrowserContext:
 			return True
 
 		try:
-			from urllib.parse import urlparse
-
 			parsed_url = urlparse(url)
 			domain = parsed_url.netloc.lower()
 
@@ -617,9 +685,24 @@ class BrowserContext:
 		if not self._is_url_allowed(url):
 			raise BrowserError(f'Navigation to non-allowed URL: {url}')
 
+		# don't wait for another timeout on a url that just failed - drop expired entries first
+		now = time.time()
+		self._failed_urls = {failed_url: until for failed_url, until in self._failed_urls.items() if until > now}
+		if url in self._failed_urls:
+			raise BrowserError(f'Skipping {url} - it failed to load recently, try a different url')
+
 		page = await self.get_current_page()
-		await page.goto(url)
-		await page.wait_for_load_state()
+		try:
+			response = await page.goto(url)
+			await page.wait_for_load_state()
+		except PlaywrightError as e:
+			# only remember failures that will most likely happen again, not aborted or interrupted navigations
+			if isinstance(e, TimeoutError) or any(error in str(e) for error in DEAD_URL_NET_ERRORS):
+				self._failed_urls[url] = time.time() + FAILED_URL_TTL
+			raise
+
+		if response is not None and response.status in (404, 410):
+			self._failed_urls[url] = time.time() + FAILED_URL_TTL
 
 	async def refresh_page(self):
 		"""Refresh the current page"""
@@ -928,9 +1011,6 @@ class BrowserContext:
 
 			# Handle class attributes
 			if 'class' in element.attributes and element.attributes['class'] and include_dynamic_attributes:
-				# Define a regex pattern for valid class names in CSS
-				valid_class_name_pattern = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_-]*$')
-
 				# Iterate through the class attribute values
 				classes = element.attributes['class'].split()
 				for class_name in classes:
@@ -939,48 +1019,14 @@ class BrowserContext:
 						continue
 
 					# Check if the class name is valid
-					if valid_class_name_pattern.match(class_name):
+					if VALID_CLASS_NAME_PATTERN.match(class_name):
 						# Append the valid class name to the CSS selector
 						css_selector += f'.{class_name}'
 					else:
 						# Skip invalid class names
 						continue
 
-			# Expanded set of safe attributes that are stable and useful for selection
-			SAFE_ATTRIBUTES = {
-				# Data attributes (if they're stable in your application)
-				'id',
-				# Standard HTML attributes
-				'name',
-				'type',
-				'placeholder',
-				# Accessibility attributes
-				'aria-label',
-				'aria-labelledby',
-				'aria-describedby',
-				'role',
-				# Common form attributes
-				'for',
-				'autocomplete',
-				'required',
-				'readonly',
-				# Media attributes
-				'alt',
-				'title',
-				'src',
-				# Custom stable attributes (add any application-specific ones)
-				'href',
-				'target',
-			}
-
-			if include_dynamic_attributes:
-				dynamic_attributes = {
-					'data-id',
-					'data-qa',
-					'data-cy',
-					'data-testid',
-				}
-				SAFE_ATTRIBUTES.update(dynamic_attributes)
+			safe_attributes = SAFE_AND_DYNAMIC_ATTRIBUTES if include_dynamic_attributes else SAFE_ATTRIBUTES
 
 			# Handle other attributes
 			for attribute, value in element.attributes.items():
@@ -991,7 +1037,7 @@ class BrowserContext:
 				if not attribute.strip():
 					continue
 
-				if attribute not in SAFE_ATTRIBUTES:
+				if attribute not in safe_attributes:
 					continue
 
 				# Escape special characters in attribute names
@@ -1003,7 +1049,7 @@ class BrowserContext:
 				elif any(char in value for char in '"\'<>`\n\r\t'):
 					# Use contains for values with special characters
 					# Regex-substitute *any* whitespace with a single space, then strip.
-					collapsed_value = re.sub(r'\s+', ' ', value).strip()
+					collapsed_value = WHITESPACE_PATTERN.sub(' ', value).strip()
 					# Escape embedded double-quotes.
 					safe_value = collapsed_value.replace('"', '\\"')
 					css_selector += f'[{safe_attribute}*="{safe_value}"]'
@@ -1163,12 +1209,11 @@ class BrowserContext:
 		"""Get information about all tabs"""
 		session = await self.get_session()
 
-		tabs_info = []
-		for page_id, page in enumerate(session.context.pages):
-			tab_info = TabInfo(page_id=page_id, url=page.url, title=await page.title())
-			tabs_info.append(tab_info)
+		pages = session.context.pages
+		# fetch all titles at once instead of one round trip per tab
+		titles = await asyncio.gather(*(page.title() for page in pages))
 
-		return tabs_info
+		return [TabInfo(page_id=page_id, url=page.url, title=title) for page_id, (page, title) in enumerate(zip(pages, titles))]
 
 	@time_execution_async('--switch_to_tab')
 	async def switch_to_tab(self, page_id: int) -> None:
@@ -1254,19 +1299,19 @@ class BrowserContext:
 	async def save_cookies(self):
 		"""Save current cookies to file"""
 		if self.session and self.session.context and self.config.cookies_file:
-			try:
-				cookies = await self.session.context.cookies()
-				logger.debug(f'Saving {len(cookies)} cookies to {self.config.cookies_file}')
+			async with self._cookies_lock:
+				try:
+					cookies = await self.session.context.cookies()
+					logger.debug(f'Saving {len(cookies)} cookies to {self.config.cookies_file}')
 
-				# Check if the path is a directory and create it if necessary
-				dirname = os.path.dirname(self.config.cookies_file)
-				if dirname:
-					os.makedirs(dirname, exist_ok=True)
+					# Check if the path is a directory and create it if necessary
+					dirname = os.path.dirname(self.config.cookies_file)
+					if dirname:
+						os.makedirs(dirname, exist_ok=True)
 
-				with open(self.config.cookies_file, 'w') as f:
-					json.dump(cookies, f)
-			except Exception as e:
-				logger.warning(f'Failed to save cookies: {str(e)}')
+					await asyncio.to_thread(Path(self.config.cookies_file).write_bytes, orjson.dumps(cookies))
+				except Exception as e:
+					logger.warning(f'Failed to save cookies: {str(e)}')
 
 	async def is_file_uploader(self, element_node: DOMElementNode, max_depth: int = 3, current_depth: int = 0) -> bool:
 		"""Check if element or its children are file uploaders"""
@@ -1297,9 +1342,10 @@ class BrowserContext:
 
 	async def get_scroll_info(self, page: Page) -> tuple[int, int]:
 		"""Get scroll position information for the current page."""
-		scroll_y = await page.evaluate('window.scrollY')
-		viewport_height = await page.evaluate('window.innerHeight')
-		total_height = await page.evaluate('document.documentElement.scrollHeight')
+		# one round trip instead of one per value
+		scroll_y, viewport_height, total_height = await page.evaluate(
+			'[window.scrollY, window.innerHeight, document.documentElement.scrollHeight]'
+		)
 		pixels_above = scroll_y
 		pixels_below = total_height - (scroll_y + viewport_height)
 		return pixels_above, pixels_below
@@ -1,4 +1,5 @@
 import asyncio
+import re
 from inspect import iscoroutinefunction, signature
 from typing import Any, Callable, Dict, Generic, Optional, Type, TypeVar
 
@@ -20,6 +21,8 @@ from browser_use.utils import time_execution_async, time_execution_sync
 
 Context = TypeVar('Context')
 
+SECRET_PATTERN = re.compile(r'<secret>(.*?)</secret>')
+
 
 class Registry(Generic[Context]):
 	"""Service for registering and managing actions"""
@@ -28,6 +31,7 @@ class Registry(Generic[Context]):
 		self.registry = ActionRegistry()
 		self.telemetry = ProductTelemetry()
 		self.exclude_actions = exclude_actions if exclude_actions is not None else []
+		self._prompt_description: str | None = None
 
 	@time_execution_sync('--create_param_model')
 	def _create_param_model(self, function: Callable) -> Type[BaseModel]:
@@ -81,6 +85,7 @@ class Registry(Generic[Context]):
 				param_model=actual_param_model,
 			)
 			self.registry.actions[func.__name__] = action
+			self._prompt_description = None
 			return func
 
 		return decorator
@@ -106,11 +111,8 @@ class Registry(Generic[Context]):
 			# Create the validated Pydantic model
 			validated_params = action.param_model(**params)
 
-			# Check if the first parameter is a Pydantic model
-			sig = signature(action.function)
-			parameters = list(sig.parameters.values())
-			is_pydantic = parameters and issubclass(parameters[0].annotation, BaseModel)
-			parameter_names = [param.name for param in parameters]
+			parameter_names = action.parameter_names
+			is_pydantic = action.is_pydantic
 
 			if sensitive_data:
 				validated_params = self._replace_sensitive_data(validated_params, sensitive_data)
@@ -149,13 +151,9 @@ class Registry(Generic[Context]):
 		"""Replaces the sensitive data in the params"""
 		# if there are any str with <secret>placeholder</secret> in the params, replace them with the actual value from sensitive_data
 
-		import re
-
-		secret_pattern = re.compile(r'<secret>(.*?)</secret>')
-
 		def replace_secrets(value):
 			if isinstance(value, str):
-				matches = secret_pattern.findall(value)
+				matches = SECRET_PATTERN.findall(value)
 				for placeholder in matches:
 					if placeholder in sensitive_data:
 						value = value.replace(f'<secret>{placeholder}</secret>', sensitive_data[placeholder])
@@ -164,9 +162,12 @@ class Registry(Generic[Context]):
 				return {k: replace_secrets(v) for k, v in value.items()}
 			elif isinstance(value, list):
 				return [replace_secrets(v) for v in value]
+			elif isinstance(value, BaseModel):
+				return replace_secrets(value.model_dump())
 			return value
 
-		for key, value in params.model_dump().items():
+		# walk the field values directly, only containers that can hold secrets get rebuilt
+		for key, value in params.__dict__.items():
 			params.__dict__[key] = replace_secrets(value)
 		return params
 
@@ -196,4 +197,7 @@ class Registry(Generic[Context]):
 
 	def get_prompt_description(self) -> str:
 		"""Get a description of all actions for the prompt"""
-		return self.registry.get_prompt_description()
+		# cached until the next action is registered
+		if self._prompt_description is None:
+			self._prompt_description = self.registry.get_prompt_description()
+		return self._prompt_description
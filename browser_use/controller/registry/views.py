@@ -1,6 +1,7 @@
-from typing import Callable, Dict, Type
+from inspect import signature
+from typing import Any, Callable, Dict, Type
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, model_validator
 
 
 class RegisteredAction(BaseModel):
@@ -10,9 +11,29 @@ class RegisteredAction(BaseModel):
 	description: str
 	function: Callable
 	param_model: Type[BaseModel]
+	# derived from the function signature when the action is created
+	parameter_names: frozenset[str]
+	is_pydantic: bool
 
 	model_config = ConfigDict(arbitrary_types_allowed=True)
 
+	@model_validator(mode='before')
+	@classmethod
+	def derive_signature_info(cls, value: Any) -> Any:
+		"""
+		Resolve the function signature once here instead of on every execution,
+		so actions created outside Registry.action get the same info.
+		"""
+		if isinstance(value, dict) and callable(value.get('function')):
+			parameters = list(signature(value['function']).parameters.values())
+			first_annotation = parameters[0].annotation if parameters else None
+			value = {
+				'parameter_names': frozenset(param.name for param in parameters),
+				'is_pydantic': isinstance(first_annotation, type) and issubclass(first_annotation, BaseModel),
+				**value,
+			}
+		return value
+
 	def prompt_description(self) -> str:
 		"""Get a description of the action for the prompt"""
 		skip_keys = ['title']
@@ -40,19 +61,17 @@ class ActionModel(BaseModel):
 	def get_index(self) -> int | None:
 		"""Get the index of the action"""
 		# {'clicked_element': {'index':5}}
-		params = self.model_dump(exclude_unset=True).values()
-		if not params:
-			return None
-		for param in params:
-			if param is not None and 'index' in param:
-				return param['index']
+		# read the set fields directly instead of serializing the whole model
+		for action_name in self.model_fields_set:
+			params = getattr(self, action_name)
+			if params is not None and hasattr(params, 'index'):
+				return params.index
 		return None
 
 	def set_index(self, index: int):
 		"""Overwrite the index of the action"""
 		# Get the action name and params
-		action_data = self.model_dump(exclude_unset=True)
-		action_name = next(iter(action_data.keys()))
+		action_name = next(iter(self.model_fields_set))
 		action_params = getattr(self, action_name)
 
 		# Update the index directly on the model
@@ -1,8 +1,10 @@
 import asyncio
+import hashlib
 import json
 import logging
 from typing import Dict, Generic, Optional, Type, TypeVar
 
+import markdownify
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.prompts import PromptTemplate
 
@@ -31,6 +33,27 @@ logger = logging.getLogger(__name__)
 
 Context = TypeVar('Context')
 
+EXTRACT_CONTENT_PROMPT = PromptTemplate(
+	input_variables=['goal', 'page'],
+	template='Your task is to extract the content of the page. You will be given a page and a goal and you should extract all relevant information around this goal from the page. If the goal is vague, summarize the page. Respond in json format. Extraction goal: {goal}, Page: {page}',
+)
+
+# page chrome and non-text elements left out of extract_content - markdownify already drops script and style
+PAGE_BOILERPLATE_SELECTOR = 'nav, footer, [role=navigation], [role=contentinfo], noscript, template, svg, iframe'
+
+
+class PageContentConverter(markdownify.MarkdownConverter):
+	"""Markdown converter that removes navigation, footers and other boilerplate from the parsed page before converting"""
+
+	def convert_soup(self, soup):
+		for element in soup.select(PAGE_BOILERPLATE_SELECTOR):
+			element.decompose()
+		return super().convert_soup(soup)
+
+
+# extract_content results kept per controller, keyed on (extraction model, goal, page content hash)
+MAX_EXTRACTION_CACHE_SIZE = 32
+
 
 class Controller(Generic[Context]):
 	def __init__(
@@ -39,6 +62,7 @@ class Controller(Generic[Context]):
 		output_model: Optional[Type[BaseModel]] = None,
 	):
 		self.registry = Registry[Context](exclude_actions)
+		self._extraction_cache: Dict[tuple[str, str, str, str], str] = {}
 
 		"""Register all default browser actions"""
 
@@ -79,9 +103,7 @@ class Controller(Generic[Context]):
 
 		@self.registry.action('Navigate to URL in the current tab', param_model=GoToUrlAction)
 		async def go_to_url(params: GoToUrlAction, browser: BrowserContext):
-			page = await browser.get_current_page()
-			await page.goto(params.url)
-			await page.wait_for_load_state()
+			await browser.navigate_to(params.url)
 			msg = f'🔗  Navigated to {params.url}'
 			logger.info(msg)
 			return ActionResult(extracted_content=msg, include_in_memory=True)
@@ -181,15 +203,30 @@ class Controller(Generic[Context]):
 		)
 		async def extract_content(goal: str, browser: BrowserContext, page_extraction_llm: BaseChatModel):
 			page = await browser.get_current_page()
-			import markdownify
-
-			content = markdownify.markdownify(await page.content())
+			content = PageContentConverter().convert(await page.content())
+
+			# same goal on an unchanged page - reuse the previous extraction instead of another LLM call
+			# the default controller is shared between agents, which may use different extraction models
+			# without a model name, fall back to the instance so different llms of one class never share entries
+			llm_name = getattr(page_extraction_llm, 'model_name', None) or getattr(page_extraction_llm, 'model', None)
+			cache_key = (
+				page_extraction_llm.__class__.__name__,
+				str(llm_name) if llm_name else f'id:{id(page_extraction_llm)}',
+				goal,
+				hashlib.sha256(content.encode()).hexdigest(),
+			)
+			if cache_key in self._extraction_cache:
+				msg = self._extraction_cache[cache_key]
+				logger.info(msg)
+				return ActionResult(extracted_content=msg, include_in_memory=True)
 
-			prompt = 'Your task is to extract the content of the page. You will be given a page and a goal and you should extract all relevant information around this goal from the page. If the goal is vague, summarize the page. Respond in json format. Extraction goal: {goal}, Page: {page}'
-			template = PromptTemplate(input_variables=['goal', 'page'], template=prompt)
 			try:
-				output = page_extraction_llm.invoke(template.format(goal=goal, page=content))
+				output = await page_extraction_llm.ainvoke(EXTRACT_CONTENT_PROMPT.format(goal=goal, page=content))
 				msg = f'📄  Extracted from page\n: {output.content}\n'
+				if len(self._extraction_cache) >= MAX_EXTRACTION_CACHE_SIZE:
+					# drop the oldest entry
+					del self._extraction_cache[next(iter(self._extraction_cache))]
+				self._extraction_cache[cache_key] = msg
 				logger.info(msg)
 				return ActionResult(extracted_content=msg, include_in_memory=True)
 			except Exception as e:
@@ -37,8 +37,8 @@ class HistoryTreeProcessor:
 
 		def process_node(node: DOMElementNode):
 			if node.highlight_index is not None:
-				hashed_node = HistoryTreeProcessor._hash_dom_element(node)
-				if hashed_node == hashed_dom_history_element:
+				# node.hash is memoized, so repeated lookups in the same tree only hash each node once
+				if node.hash == hashed_dom_history_element:
 					return node
 			for child in node.children:
 				if isinstance(child, DOMElementNode):
@@ -52,9 +52,7 @@ class HistoryTreeProcessor:
 	@staticmethod
 	def compare_history_element_and_dom_element(dom_history_element: DOMHistoryElement, dom_element: DOMElementNode) -> bool:
 		hashed_dom_history_element = HistoryTreeProcessor._hash_dom_history_element(dom_history_element)
-		hashed_dom_element = HistoryTreeProcessor._hash_dom_element(dom_element)
-
-		return hashed_dom_history_element == hashed_dom_element
+		return hashed_dom_history_element == dom_element.hash
 
 	@staticmethod
 	def _hash_dom_history_element(dom_history_element: DOMHistoryElement) -> HashedDomElement:
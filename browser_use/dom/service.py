@@ -2,6 +2,7 @@ import gc
 import json
 import logging
 from dataclasses import dataclass
+from functools import cache
 from importlib import resources
 from typing import TYPE_CHECKING, Optional
 
@@ -20,6 +21,12 @@ from browser_use.utils import time_execution_async
 logger = logging.getLogger(__name__)
 
 
+@cache
+def _load_build_dom_tree_js() -> str:
+	"""Read the DOM extraction script once - DomService is created on every state update"""
+	return resources.read_text('browser_use.dom', 'buildDomTree.js')
+
+
 @dataclass
 class ViewportInfo:
 	width: int
@@ -31,7 +38,7 @@ class DomService:
 		self.page = page
 		self.xpath_cache = {}
 
-		self.js_code = resources.read_text('browser_use.dom', 'buildDomTree.js')
+		self.js_code = _load_build_dom_tree_js()
 
 	# region - Clickable elements
 	@time_execution_async('--get_clickable_elements')
@@ -0,0 +1,65 @@
+import logging
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+def setup_llm_cache():
+	"""
+	Configure LangChain's global LLM response cache from the environment.
+
+	`BROWSER_USE_LLM_CACHE` selects the backend:
+		- unset / none: no caching (default)
+		- memory: in-process cache, lost on exit
+		- sqlite: on-disk cache at `BROWSER_USE_LLM_CACHE_PATH` (default `.browser_use_llm_cache.db`),
+		  requires `langchain-community`
+
+	Identical (model, messages, params) calls are then served from the cache. This only makes sense for
+	deterministic models (temperature=0), e.g. when re-running the same task while debugging.
+	"""
+	cache_type = os.getenv('BROWSER_USE_LLM_CACHE', 'none').lower()
+	if cache_type in ('', 'none', 'false'):
+		return
+
+	from langchain_core.globals import set_llm_cache
+
+	if cache_type == 'memory':
+		from langchain_core.caches import InMemoryCache
+
+		set_llm_cache(InMemoryCache())
+	elif cache_type == 'sqlite':
+		try:
+			from langchain_community.cache import SQLiteCache
+		except ImportError:
+			logger.warning('BROWSER_USE_LLM_CACHE=sqlite requires langchain-community: pip install langchain-community')
+			return
+
+		database_path = os.getenv('BROWSER_USE_LLM_CACHE_PATH', '.browser_use_llm_cache.db')
+		set_llm_cache(SQLiteCache(database_path=database_path))
+	else:
+		logger.warning(f'Unknown BROWSER_USE_LLM_CACHE value: {cache_type} - available: none | memory | sqlite')
+		return
+
+	logger.debug(f'LLM response cache enabled: {cache_type}')
+
+
+def warn_if_llm_not_deterministic(llm) -> None:
+	"""
+	Warn when the global LLM cache is enabled for a model that samples with temperature > 0 -
+	a cached run then replays one sample instead of exploring.
+	"""
+	from langchain_core.globals import get_llm_cache
+
+	if get_llm_cache() is None:
+		return
+
+	temperature = getattr(llm, 'temperature', None)
+	if isinstance(temperature, (int, float)) and temperature > 0:
+		logger.warning(
+			f'LLM response cache is enabled but the model uses temperature={temperature} - '
+			'identical prompts will replay the cached answer, set temperature=0 or BROWSER_USE_LLM_CACHE=none'
+		)
@@ -15,6 +15,9 @@ def time_execution_sync(additional_text: str = '') -> Callable[[Callable[P, R]],
 	def decorator(func: Callable[P, R]) -> Callable[P, R]:
 		@wraps(func)
 		def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+			# timings are only logged at debug level, skip measuring otherwise
+			if not logger.isEnabledFor(logging.DEBUG):
+				return func(*args, **kwargs)
 			start_time = time.time()
 			result = func(*args, **kwargs)
 			execution_time = time.time() - start_time
@@ -32,6 +35,8 @@ def time_execution_async(
 	def decorator(func: Callable[P, Coroutine[Any, Any, R]]) -> Callable[P, Coroutine[Any, Any, R]]:
 		@wraps(func)
 		async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+			if not logger.isEnabledFor(logging.DEBUG):
+				return await func(*args, **kwargs)
 			start_time = time.time()
 			result = await func(*args, **kwargs)
 			execution_time = time.time() - start_time
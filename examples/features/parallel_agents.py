@@ -4,6 +4,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import asyncio
 
+from langchain_core.rate_limiters import InMemoryRateLimiter
 from langchain_openai import ChatOpenAI
 
 from browser_use.agent.service import Agent
@@ -17,7 +18,18 @@ browser = Browser(
 		new_context_config=BrowserContextConfig(save_recording_path='./tmp/recordings'),
 	)
 )
-llm = ChatOpenAI(model='gpt-4o')
+# Shared token bucket: all agents draw from the same budget, so requests are spread out
+# up front instead of hitting 429s and sleeping in the retry loop
+rate_limiter = InMemoryRateLimiter(requests_per_second=2, check_every_n_seconds=0.1, max_bucket_size=4)
+llm = ChatOpenAI(model='gpt-4o', rate_limiter=rate_limiter)
+
+# Limit how many agents drive the browser at the same time
+max_concurrent_agents = asyncio.Semaphore(4)
+
+
+async def run_agent(agent: Agent):
+	async with max_concurrent_agents:
+		return await agent.run()
 
 
 async def main():
@@ -37,7 +49,7 @@ async def main():
 		]
 	]
 
-	await asyncio.gather(*[agent.run() for agent in agents])
+	await asyncio.gather(*[run_agent(agent) for agent in agents])
 
 	# async with await browser.new_context() as context:
 	agentX = Agent(
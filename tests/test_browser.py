@@ -303,4 +303,39 @@ async def test_standard_browser_launch_with_proxy(monkeypatch):
     # Call get_playwright_browser and verify that the returned browser is as expected.
     result_browser = await browser_obj.get_playwright_browser()
     assert isinstance(result_browser, DummyBrowser), "Expected DummyBrowser from _setup_standard_browser with proxy provided"
-    await browser_obj.close()
\ No newline at end of file
+    await browser_obj.close()
+@pytest.mark.asyncio
+async def test_disk_cache_dir(monkeypatch):
+    """
+    Test that disk_cache_dir is passed to Chromium for the standard launch and that a warning
+    is logged when it is combined with cdp_url, where it has no effect.
+    """
+    class DummyBrowser:
+        pass
+    launch_args = []
+    class DummyChromium:
+        async def launch(self, headless, args, proxy=None):
+            launch_args.extend(args)
+            return DummyBrowser()
+        async def connect_over_cdp(self, endpoint_url, timeout=20000):
+            return DummyBrowser()
+    class DummyPlaywright:
+        def __init__(self):
+            self.chromium = DummyChromium()
+        async def stop(self):
+            pass
+    class DummyAsyncPlaywrightContext:
+        async def start(self):
+            return DummyPlaywright()
+    monkeypatch.setattr("browser_use.browser.browser.async_playwright", lambda: DummyAsyncPlaywrightContext())
+    warnings = []
+    monkeypatch.setattr("browser_use.browser.browser.logger.warning", lambda msg: warnings.append(msg))
+    browser_obj = Browser(config=BrowserConfig(headless=True, disk_cache_dir="/tmp/browser-cache"))
+    await browser_obj.get_playwright_browser()
+    assert "--disk-cache-dir=/tmp/browser-cache" in launch_args
+    assert warnings == []
+    await browser_obj.close()
+    browser_obj = Browser(config=BrowserConfig(cdp_url="ws://dummy-cdp-url", disk_cache_dir="/tmp/browser-cache"))
+    await browser_obj.get_playwright_browser()
+    assert len(warnings) == 1 and "disk_cache_dir" in warnings[0]
+    await browser_obj.close()
@@ -1,11 +1,15 @@
 import asyncio
 import base64
+import json
 import os
+import time
 import pytest
+from playwright._impl._errors import Error as PlaywrightError
+from playwright._impl._errors import TimeoutError as PlaywrightTimeoutError
 from browser_use.browser.context import BrowserContext, BrowserContextConfig
-from browser_use.browser.views import BrowserState
+from browser_use.browser.views import BrowserError, BrowserState
 from browser_use.dom.views import DOMElementNode
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock, patch
 
 def test_is_url_allowed():
     """
@@ -151,19 +155,17 @@ async def test_get_scroll_info():
     """
     Test the get_scroll_info method by mocking the page's evaluate method.
     This dummy page returns preset values for window.scrollY, window.innerHeight,
-    and document.documentElement.scrollHeight. The test then verifies that the 
+    and document.documentElement.scrollHeight in a single evaluate call. The test then verifies that the 
     computed scroll information (pixels_above and pixels_below) match the expected values.
     """
     # Define a dummy page with an async evaluate method returning preset values.
     class DummyPage:
+        def __init__(self):
+            self.scripts = []
         async def evaluate(self, script):
-            if "window.scrollY" in script:
-                return 100  # scrollY
-            elif "window.innerHeight" in script:
-                return 500  # innerHeight
-            elif "document.documentElement.scrollHeight" in script:
-                return 1200  # total scrollable height
-            return None
+            self.scripts.append(script)
+            # [scrollY, innerHeight, total scrollable height]
+            return [100, 500, 1200]
     # Create a dummy session with a dummy current_page.
     dummy_session = type("DummySession", (), {})()
     dummy_session.current_page = DummyPage()
@@ -183,6 +185,8 @@ async def test_get_scroll_info():
     # pixels_below = total_height - (scrollY + innerHeight) = 1200 - (100 + 500) = 600
     assert pixels_above == 100, f"Expected 100 pixels above, got {pixels_above}"
     assert pixels_below == 600, f"Expected 600 pixels below, got {pixels_below}"
+    # all three values are read in one round trip
+    assert len(dummy_session.current_page.scripts) == 1
 @pytest.mark.asyncio
 async def test_reset_context():
     """
@@ -323,4 +327,158 @@ async def test_remove_highlights_failure():
     try:
         await context.remove_highlights()
     except Exception as e:
-        pytest.fail(f"remove_highlights raised an exception: {e}")
\ No newline at end of file
+        pytest.fail(f"remove_highlights raised an exception: {e}")
+def test_is_request_blocked():
+    """
+    Test the _is_request_blocked method used to route-block requests.
+    Blocked resource types match exactly, blocked domains match the domain itself
+    and its subdomains, case-insensitively.
+    """
+    dummy_browser = Mock()
+    dummy_browser.config = Mock()
+    def request(url, resource_type="document"):
+        return Mock(url=url, resource_type=resource_type)
+    # Nothing blocked by default
+    context = BrowserContext(browser=dummy_browser, config=BrowserContextConfig())
+    assert context._is_request_blocked(request("https://example.com/image.png", "image")) is False
+    config = BrowserContextConfig(blocked_resource_types=["image", "font"], blocked_domains=["Tracker.com"])
+    context = BrowserContext(browser=dummy_browser, config=config)
+    # Resource types
+    assert context._is_request_blocked(request("https://example.com/a.png", "image")) is True
+    assert context._is_request_blocked(request("https://example.com/a.woff", "font")) is True
+    assert context._is_request_blocked(request("https://example.com/a.js", "script")) is False
+    # Exact domain and subdomain, case-insensitive
+    assert context._is_request_blocked(request("https://tracker.com/pixel")) is True
+    assert context._is_request_blocked(request("https://cdn.TRACKER.com/pixel")) is True
+    # Similar looking domains are not blocked
+    assert context._is_request_blocked(request("https://nottracker.com/pixel")) is False
+    assert context._is_request_blocked(request("https://tracker.com.example.org/pixel")) is False
+@pytest.mark.asyncio
+async def test_block_requests_route():
+    """
+    Test that _block_requests aborts blocked requests and lets the rest through.
+    """
+    dummy_browser = Mock()
+    dummy_browser.config = Mock()
+    context = BrowserContext(browser=dummy_browser, config=BrowserContextConfig(blocked_resource_types=["image"]))
+    class DummyRoute:
+        def __init__(self, resource_type):
+            self.request = Mock(url="https://example.com/", resource_type=resource_type)
+            self.calls = []
+        async def abort(self):
+            self.calls.append("abort")
+        async def fallback(self):
+            self.calls.append("fallback")
+    blocked = DummyRoute("image")
+    await context._block_requests(blocked)
+    assert blocked.calls == ["abort"]
+    allowed = DummyRoute("document")
+    await context._block_requests(allowed)
+    assert allowed.calls == ["fallback"]
+class DummyNavigationPage:
+    """
+    Minimal page for navigate_to: goto either raises the given error or returns a response with the given status.
+    """
+    def __init__(self, error=None, status=200):
+        self.error = error
+        self.status = status
+        self.goto_calls = 0
+    async def goto(self, url):
+        self.goto_calls += 1
+        if self.error is not None:
+            raise self.error
+        return Mock(status=self.status)
+    async def wait_for_load_state(self):
+        pass
+def make_navigation_context(page):
+    dummy_browser = Mock()
+    dummy_browser.config = Mock()
+    context = BrowserContext(browser=dummy_browser, config=BrowserContextConfig())
+    context.get_current_page = AsyncMock(return_value=page)
+    return context
+@pytest.mark.asyncio
+async def test_navigate_to_skips_recently_failed_url():
+    """
+    Test that navigate_to marks a url as failed after a timeout or a dns/connection error
+    and skips it on the next call without calling goto again.
+    """
+    url = "https://example.com"
+    for error in (PlaywrightTimeoutError("Timeout 30000ms exceeded"), PlaywrightError("net::ERR_NAME_NOT_RESOLVED at https://example.com")):
+        page = DummyNavigationPage(error=error)
+        context = make_navigation_context(page)
+        with pytest.raises(PlaywrightError):
+            await context.navigate_to(url)
+        assert url in context._failed_urls
+        with pytest.raises(BrowserError, match="failed to load recently"):
+            await context.navigate_to(url)
+        assert page.goto_calls == 1
+@pytest.mark.asyncio
+async def test_navigate_to_does_not_mark_aborted_navigation():
+    """
+    Test that other navigation errors, like an aborted navigation or a download, are raised
+    but not remembered, so the url can be retried right away.
+    """
+    url = "https://example.com/file.zip"
+    page = DummyNavigationPage(error=PlaywrightError("net::ERR_ABORTED at https://example.com/file.zip"))
+    context = make_navigation_context(page)
+    with pytest.raises(PlaywrightError):
+        await context.navigate_to(url)
+    assert url not in context._failed_urls
+    with pytest.raises(PlaywrightError):
+        await context.navigate_to(url)
+    assert page.goto_calls == 2
+@pytest.mark.asyncio
+async def test_navigate_to_failed_url_expires():
+    """
+    Test that a failed url is retried once its ttl has passed and that expired entries
+    for other urls are evicted too.
+    """
+    url = "https://example.com"
+    page = DummyNavigationPage()
+    context = make_navigation_context(page)
+    context._failed_urls[url] = time.time() - 1
+    context._failed_urls["https://other.com"] = time.time() - 1
+    await context.navigate_to(url)
+    assert page.goto_calls == 1
+    assert context._failed_urls == {}
+@pytest.mark.asyncio
+async def test_navigate_to_marks_missing_pages():
+    """
+    Test that 404 and 410 responses mark the url as failed while other statuses do not.
+    """
+    for status, marked in ((404, True), (410, True), (200, False), (500, False)):
+        url = f"https://example.com/{status}"
+        context = make_navigation_context(DummyNavigationPage(status=status))
+        await context.navigate_to(url)
+        assert (url in context._failed_urls) is marked
+@pytest.mark.asyncio
+async def test_save_cookies_writes_do_not_overlap(tmp_path):
+    """
+    Test that concurrent save_cookies calls (the background save from get_state and the one in close)
+    write one after the other, so a longer earlier write can't leave its tail in the file.
+    """
+    cookies_file = tmp_path / "cookies.json"
+    dummy_browser = Mock()
+    dummy_browser.config = Mock()
+    context = BrowserContext(browser=dummy_browser, config=BrowserContextConfig(cookies_file=str(cookies_file)))
+    long_cookies = [{"name": f"cookie{i}", "value": "x" * 1000} for i in range(50)]
+    short_cookies = [{"name": "session", "value": "y"}]
+    dummy_session = Mock()
+    dummy_session.context.cookies = AsyncMock(side_effect=[long_cookies, short_cookies])
+    context.session = dummy_session
+    active_writes = 0
+    max_active_writes = 0
+    original_to_thread = asyncio.to_thread
+    async def tracking_to_thread(func, *args):
+        nonlocal active_writes, max_active_writes
+        active_writes += 1
+        max_active_writes = max(max_active_writes, active_writes)
+        try:
+            await asyncio.sleep(0.01)
+            return await original_to_thread(func, *args)
+        finally:
+            active_writes -= 1
+    with patch("browser_use.browser.context.asyncio.to_thread", tracking_to_thread):
+        await asyncio.gather(context.save_cookies(), context.save_cookies())
+    assert max_active_writes == 1
+    assert json.loads(cookies_file.read_text()) == short_cookies
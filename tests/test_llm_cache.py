@@ -0,0 +1,62 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import get_llm_cache, set_llm_cache
+
+from browser_use.llm_cache import setup_llm_cache, warn_if_llm_not_deterministic
+
+
+@pytest.fixture(autouse=True)
+def reset_llm_cache():
+	set_llm_cache(None)
+	yield
+	set_llm_cache(None)
+
+
+@pytest.mark.parametrize('value', ['', 'none', 'false'])
+def test_setup_llm_cache_disabled(monkeypatch, value):
+	monkeypatch.setenv('BROWSER_USE_LLM_CACHE', value)
+	setup_llm_cache()
+	assert get_llm_cache() is None
+
+
+def test_setup_llm_cache_memory(monkeypatch):
+	monkeypatch.setenv('BROWSER_USE_LLM_CACHE', 'Memory')
+	setup_llm_cache()
+	assert isinstance(get_llm_cache(), InMemoryCache)
+
+
+def test_setup_llm_cache_sqlite(monkeypatch, tmp_path):
+	cache_module = pytest.importorskip('langchain_community.cache')
+	database_path = tmp_path / 'llm_cache.db'
+	monkeypatch.setenv('BROWSER_USE_LLM_CACHE', 'sqlite')
+	monkeypatch.setenv('BROWSER_USE_LLM_CACHE_PATH', str(database_path))
+	setup_llm_cache()
+	assert isinstance(get_llm_cache(), cache_module.SQLiteCache)
+	assert database_path.exists()
+
+
+def test_setup_llm_cache_unknown(monkeypatch):
+	monkeypatch.setenv('BROWSER_USE_LLM_CACHE', 'redis')
+	with patch('browser_use.llm_cache.logger') as logger:
+		setup_llm_cache()
+	assert get_llm_cache() is None
+	logger.warning.assert_called_once()
+
+
+@pytest.mark.parametrize(
+	'cache_enabled, temperature, warns',
+	[
+		(True, 0.7, True),
+		(True, 0.0, False),
+		(True, None, False),
+		(False, 0.7, False),
+	],
+)
+def test_warn_if_llm_not_deterministic(cache_enabled, temperature, warns):
+	if cache_enabled:
+		set_llm_cache(InMemoryCache())
+	with patch('browser_use.llm_cache.logger') as logger:
+		warn_if_llm_not_deterministic(Mock(temperature=temperature))
+	assert logger.warning.called is warns
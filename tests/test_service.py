@@ -2,6 +2,7 @@ from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 from pydantic import BaseModel
 
 from browser_use.agent.service import Agent
@@ -10,7 +11,7 @@ from browser_use.browser.browser import Browser
 from browser_use.browser.context import BrowserContext
 from browser_use.browser.views import BrowserState
 from browser_use.controller.registry.service import Registry
-from browser_use.controller.registry.views import ActionModel
+from browser_use.controller.registry.views import ActionModel, RegisteredAction
 from browser_use.controller.service import Controller
 
 # run with python -m pytest tests/test_service.py
@@ -80,6 +81,88 @@ class TestAgent:
 		assert 'test_action' in call_args
 		assert call_args['test_action'] == mock_controller.registry.registry.actions['test_action'].param_model.return_value  # type: ignore
 
+	@pytest.fixture
+	def anthropic_agent(self, mock_controller, mock_llm, mock_browser, mock_browser_context):
+		agent = Agent(
+			task='Test task', llm=mock_llm, controller=mock_controller, browser=mock_browser, browser_context=mock_browser_context
+		)
+		agent.chat_model_library = 'ChatAnthropic'
+		agent.model_name = 'claude-3-5-sonnet-20240620'
+		return agent
+
+	@staticmethod
+	def has_breakpoint(message: BaseMessage) -> bool:
+		return isinstance(message.content, list) and any('cache_control' in item for item in message.content)
+
+	def test_convert_input_messages_cache_breakpoints(self, anthropic_agent):
+		"""
+		Test that for Anthropic models the system message and the last message of the static
+		prefix are marked as prompt-cache breakpoints, and nothing else.
+		"""
+		input_messages = anthropic_agent._message_manager.get_messages() + [HumanMessage(content='Current state')]
+		prefix_length = anthropic_agent._message_manager.state.static_prefix_length
+		assert prefix_length > 1
+
+		converted = anthropic_agent._convert_input_messages(input_messages)
+
+		marked = [i for i, message in enumerate(converted) if self.has_breakpoint(message)]
+		assert marked == [0, prefix_length - 1]
+
+		# the input messages and the stored history keep their plain string content
+		assert not any(self.has_breakpoint(message) for message in input_messages)
+		assert not any(self.has_breakpoint(message) for message in anthropic_agent._message_manager.get_messages())
+
+	def test_convert_input_messages_without_static_prefix(self, anthropic_agent):
+		"""
+		Test that state injected from before static_prefix_length existed (0) only marks the system message.
+		"""
+		anthropic_agent._message_manager.state.static_prefix_length = 0
+		input_messages = anthropic_agent._message_manager.get_messages()
+
+		converted = anthropic_agent._convert_input_messages(input_messages)
+
+		assert [i for i, message in enumerate(converted) if self.has_breakpoint(message)] == [0]
+
+	def test_convert_input_messages_other_models(self, anthropic_agent):
+		"""
+		Test that messages for other models are passed through without breakpoints.
+		"""
+		anthropic_agent.chat_model_library = 'ChatOpenAI'
+		anthropic_agent.model_name = 'gpt-4o'
+		input_messages = anthropic_agent._message_manager.get_messages()
+
+		assert anthropic_agent._convert_input_messages(input_messages) == input_messages
+
+	@pytest.fixture
+	def agent(self, mock_llm, mock_browser, mock_browser_context):
+		return Agent(task='Test task', llm=mock_llm, browser=mock_browser, browser_context=mock_browser_context)
+
+	def test_parse_raw_output_recovers_json_content(self, agent):
+		"""
+		Test that when structured output parsing failed, agent output written as JSON in the raw content is recovered.
+		"""
+		raw = AIMessage(
+			content='```json\n{"current_state": {"evaluation_previous_goal": "Success", "memory": "", "next_goal": "Finish"}, '
+			'"action": [{"done": {"text": "Task completed", "success": true}}]}\n```'
+		)
+
+		parsed = agent._parse_raw_output(raw)
+
+		assert parsed is not None
+		assert parsed.current_state.next_goal == 'Finish'
+		assert parsed.action[0].model_dump(exclude_unset=True) == {'done': {'text': 'Task completed', 'success': True}}
+
+	@pytest.mark.parametrize(
+		'content',
+		['I will click the login button next.', '"ok"', '[1, 2]', '{"action": []}', ''],
+		ids=['prose', 'json-string', 'json-list', 'wrong-schema', 'empty'],
+	)
+	def test_parse_raw_output_returns_none(self, agent, content):
+		"""
+		Test that raw content which is not agent output JSON gives None instead of raising.
+		"""
+		assert agent._parse_raw_output(AIMessage(content=content)) is None
+
 	@pytest.mark.asyncio
 	async def test_step_error_handling(self):
 		"""
@@ -159,6 +242,54 @@ class TestRegistry:
 		# Assert that the included action was added to the registry
 		assert 'included_action' in registry_with_excludes.registry.actions
 
+	def test_action_decorator_stores_signature_info(self):
+		"""
+		Test that the action decorator resolves the parameter names and whether
+		the action takes a Pydantic model once at registration.
+		"""
+		registry = Registry()
+
+		class Params(BaseModel):
+			text: str
+
+		@registry.action('Action with a param model', param_model=Params)
+		async def pydantic_action(params: Params, browser: BrowserContext):
+			pass
+
+		@registry.action('Action with plain params')
+		def plain_action(text: str):
+			pass
+
+		pydantic_registered = registry.registry.actions['pydantic_action']
+		assert pydantic_registered.parameter_names == {'params', 'browser'}
+		assert pydantic_registered.is_pydantic is True
+
+		plain_registered = registry.registry.actions['plain_action']
+		assert plain_registered.parameter_names == {'text'}
+		assert plain_registered.is_pydantic is False
+
+	@pytest.mark.asyncio
+	async def test_registered_action_built_outside_registry(self):
+		"""
+		Test that a RegisteredAction created directly derives the same signature info
+		as the decorator, so execute_action still injects the browser.
+		"""
+		registry = Registry()
+
+		class Params(BaseModel):
+			text: str
+
+		async def custom_action(params: Params, browser: BrowserContext):
+			return f'{params.text} with {browser}'
+
+		action = RegisteredAction(name='custom_action', description='Custom action', function=custom_action, param_model=Params)
+		assert action.parameter_names == {'params', 'browser'}
+		assert action.is_pydantic is True
+
+		registry.registry.actions['custom_action'] = action
+		result = await registry.execute_action('custom_action', {'text': 'hello'}, browser='browser')
+		assert result == 'hello with browser'
+
 	@pytest.mark.asyncio
 	async def test_execute_action_with_and_without_browser_context(self):
 		"""
@@ -218,3 +349,109 @@ class TestRegistry:
 			param1='test_value', browser=mock_browser
 		)
 		registry.registry.actions['test_action_without_browser'].function.assert_called_once_with(param1='test_value')
+
+
+class TestController:
+	@pytest.fixture
+	def mock_browser(self):
+		page = Mock()
+		page.content = AsyncMock(return_value='<html><body><p>Some page content</p></body></html>')
+		browser = Mock(spec=BrowserContext)
+		browser.get_current_page = AsyncMock(return_value=page)
+		return browser
+
+	def make_llm(self, model_name: str | None):
+		llm = Mock()
+		llm.model_name = model_name
+		llm.ainvoke = AsyncMock(return_value=Mock(content=f'extracted by {model_name}'))
+		return llm
+
+	async def extract(self, controller: Controller, goal: str, browser, llm) -> ActionResult:
+		return await controller.registry.execute_action(
+			'extract_content', {'goal': goal}, browser=browser, page_extraction_llm=llm
+		)
+
+	@pytest.mark.asyncio
+	async def test_extract_content_cache(self, mock_browser):
+		"""
+		Test that extract_content reuses results for the same goal, page and extraction model,
+		and calls the LLM again when any of them changes.
+		"""
+		controller = Controller()
+		small_llm = self.make_llm('small')
+		large_llm = self.make_llm('large')
+
+		first = await self.extract(controller, 'find names', mock_browser, small_llm)
+		second = await self.extract(controller, 'find names', mock_browser, small_llm)
+		assert small_llm.ainvoke.call_count == 1
+		assert first.extracted_content == second.extracted_content
+
+		# a different goal is a miss
+		await self.extract(controller, 'find prices', mock_browser, small_llm)
+		assert small_llm.ainvoke.call_count == 2
+
+		# a different extraction model must not get the other model's output
+		result = await self.extract(controller, 'find names', mock_browser, large_llm)
+		assert large_llm.ainvoke.call_count == 1
+		assert 'extracted by large' in result.extracted_content
+
+	@pytest.mark.asyncio
+	async def test_extract_content_cache_without_model_name(self, mock_browser):
+		"""
+		Test that two extraction LLMs of the same class without a model name don't share cache entries.
+		"""
+		controller = Controller()
+		first_llm = self.make_llm(None)
+		second_llm = self.make_llm(None)
+		first_llm.model = None
+		second_llm.model = None
+
+		await self.extract(controller, 'find names', mock_browser, first_llm)
+		await self.extract(controller, 'find names', mock_browser, second_llm)
+		assert first_llm.ainvoke.call_count == 1
+		assert second_llm.ainvoke.call_count == 1
+
+		# the same instance still hits its own entry
+		await self.extract(controller, 'find names', mock_browser, first_llm)
+		assert first_llm.ainvoke.call_count == 1
+
+	@pytest.mark.asyncio
+	async def test_extract_content_drops_boilerplate(self, mock_browser):
+		"""
+		Test that navigation, footers and non-text elements are left out of the content sent to the extraction model.
+		"""
+		page = await mock_browser.get_current_page()
+		page.content = AsyncMock(
+			return_value='<html><body><nav>Home | Docs</nav><div role="navigation">Sidebar</div>'
+			'<main><h1>Title</h1><p>Main text with <a href="/x">a link</a></p><svg><text>icon</text></svg></main>'
+			'<footer>Copyright</footer><noscript>Enable JS</noscript></body></html>'
+		)
+		llm = self.make_llm('small')
+
+		await self.extract(Controller(), 'find the text', mock_browser, llm)
+
+		prompt = llm.ainvoke.call_args[0][0]
+		assert 'Main text with [a link](/x)' in prompt
+		for boilerplate in ('Home | Docs', 'Sidebar', 'icon', 'Copyright', 'Enable JS'):
+			assert boilerplate not in prompt
+
+	@pytest.mark.asyncio
+	async def test_extract_content_cache_eviction(self, mock_browser):
+		"""
+		Test that the oldest extraction is evicted once the cache is full.
+		"""
+		controller = Controller()
+		llm = self.make_llm('small')
+
+		with patch('browser_use.controller.service.MAX_EXTRACTION_CACHE_SIZE', 2):
+			await self.extract(controller, 'goal 1', mock_browser, llm)
+			await self.extract(controller, 'goal 2', mock_browser, llm)
+			await self.extract(controller, 'goal 3', mock_browser, llm)
+			assert len(controller._extraction_cache) == 2
+			assert llm.ainvoke.call_count == 3
+
+			# goal 3 is still cached, goal 1 was evicted
+			await self.extract(controller, 'goal 3', mock_browser, llm)
+			assert llm.ainvoke.call_count == 3
+			await self.extract(controller, 'goal 1', mock_browser, llm)
+			assert llm.ainvoke.call_count == 4